@@ -1,4 +1,5 @@
 # app/__init__.py
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask
 
 
@@ -11,20 +12,32 @@ def create_app():
     os.makedirs("data", exist_ok=True)
     os.makedirs("data/quarantine", exist_ok=True)
 
-    from engine.logger import init_db
-    from engine.model_loader import load_model
+    from engine import warmup
 
     with app.app_context():
-        init_db()        
-        load_model()     
+        warmup()
+
+    app.executor = ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 1))
 
 
     from .routes import main
     app.register_blueprint(main)
 
 
+    from engine.cache import cache_info
+    from engine.model_loader import model_status, model_error
+
     @app.route('/health')
     def health():
-        return {"status": "healthy", "service": "Phishing Shield"}, 200
+        status = model_status()
+        body = {
+            "status": status,
+            "service": "Phishing Shield",
+            "cache": cache_info(),
+            "pending_scans": app.executor._work_queue.qsize()
+        }
+        if status == "error":
+            body["error"] = model_error()
+        return body, 200 if status == "ready" else 503
 
     return app
\ No newline at end of file
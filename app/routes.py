@@ -1,106 +1,191 @@
-from flask import Blueprint, render_template, request, jsonify
+import math
+import threading
+import time
+import numpy as np
+from concurrent.futures import TimeoutError as ScanTimeout
+from flask import Blueprint, render_template, request, jsonify, current_app, make_response
 from datetime import datetime
-from engine.processor import process_email
+from engine.cache import cached_process
+
+
+# Oversized pastes are cut to the head (headers, call-to-action links) plus
+# the tail (signature, footer links) before they reach the detection engine
+MAX_EMAIL_CHARS = 256 * 1024
+KEEP_HEAD_CHARS = 128 * 1024
+KEEP_TAIL_CHARS = 32 * 1024
+
+LABEL_CODE = {"Safe": 0, "Suspicious": 1, "Phishing": 2, "Error": 3}
+LABELS = tuple(LABEL_CODE)
+LOG_DTYPE = np.dtype([("id", "<i8"), ("label", "u1"), ("conf", "<f8")])
+
+
+class LogStore:
+    def __init__(self, maxlen: int = 10000):
+        # Ring buffer: fixed-width fields live in one packed array, the
+        # variable-length timestamp/reason strings in a parallel list
+        self._maxlen = maxlen
+        self._arr = np.empty(maxlen, dtype=LOG_DTYPE)
+        self._text = [None] * maxlen
+        self._head = 0
+        self._len = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._len
+
+    def append(self, entry: dict) -> None:
+        confidence = entry.get("confidence")
+        with self._lock:
+            i = self._head
+            self._arr[i] = (
+                self._next_id,
+                LABEL_CODE[entry["label"]],
+                math.nan if confidence is None else confidence
+            )
+            self._text[i] = (entry["timestamp"], entry["reason"])
+            self._next_id += 1
+            self._head = (i + 1) % self._maxlen
+            self._len = min(self._len + 1, self._maxlen)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = np.bincount(self._arr["label"][:self._len], minlength=len(LABELS))
+            stats = {"total": self._len}
+        stats.update(zip(LABELS, counts.tolist()))
+        return stats
+
+    def _rows(self, slots) -> list:
+        rows = []
+        for i in slots:
+            row_id, label, confidence = self._arr[i].item()
+            timestamp, reason = self._text[i]
+            rows.append({
+                "id": row_id,
+                "timestamp": timestamp,
+                "label": LABELS[label],
+                "confidence": None if math.isnan(confidence) else confidence,
+                "reason": reason
+            })
+        return rows
+
+    def tail(self, n: int) -> list:
+        with self._lock:
+            k = min(n, self._len)
+            return self._rows([(self._head - j) % self._maxlen for j in range(k, 0, -1)])
+
+    def newest_first(self) -> list:
+        with self._lock:
+            return self._rows([(self._head - j) % self._maxlen for j in range(1, self._len + 1)])
+
 
 main = Blueprint("main", __name__)
-logs = []
+logs = LogStore()
+_last_ts = (0, "")
+
+
+def _now_str_cached() -> str:
+    global _last_ts
+    now = int(time.time())
+    cached = _last_ts
+    if now != cached[0]:
+        cached = _last_ts = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    return cached[1]
+
+
+def _clip_email(email_text: str):
+    if len(email_text) <= MAX_EMAIL_CHARS:
+        return email_text, False
+    return email_text[:KEEP_HEAD_CHARS] + "\n" + email_text[-KEEP_TAIL_CHARS:], True
+
+
+def _mark_truncated(response, truncated: bool):
+    if truncated:
+        response.headers["X-Truncated"] = "1"
+    return response
 
 
 @main.route("/", methods=["GET", "POST"])
 def index():
-    global logs
-
+    truncated = False
     if request.method == "POST":
-        email_text = request.form.get("email", "").strip()
+        email_text, truncated = _clip_email(request.form.get("email", ""))
+        email_text = email_text.strip()
 
         if email_text:
-            result = process_email(email_text=email_text)
+            result = cached_process(email_text=email_text)
 
             logs.append({
-                "id": len(logs) + 1,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "timestamp": _now_str_cached(),
                 "label": result["label"],
                 "confidence": result.get("confidence"),
                 "reason": result["reason"]
             })
 
-    # Calculate stats
-    stats = {
-        "total": len(logs),
-        "Phishing": sum(1 for log in logs if log["label"] == "Phishing"),
-        "Suspicious": sum(1 for log in logs if log["label"] == "Suspicious"),
-        "Safe": sum(1 for log in logs if log["label"] == "Safe")
-    }
-
-    return render_template(
+    return _mark_truncated(make_response(render_template(
         "index.html",
-        logs=logs[-20:],  # Show only last 20
-        stats=stats,
+        logs=logs.tail(20),  # Show only last 20
+        stats=logs.stats(),
         datetime=datetime
-    )
+    )), truncated)
 
 
 @main.route("/scan", methods=["GET", "POST"])
 def scan_page():
-    global logs
-
     if request.method == "POST":
-        email_text = request.form.get("email", "").strip()
+        email_text, truncated = _clip_email(request.form.get("email", ""))
+        email_text = email_text.strip()
 
         if email_text:
-            result = process_email(email_text=email_text)
+            result = cached_process(email_text=email_text)
 
             logs.append({
-                "id": len(logs) + 1,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "timestamp": _now_str_cached(),
                 "label": result["label"],
                 "confidence": result.get("confidence"),
                 "reason": result["reason"]
             })
 
-            return render_template("scan.html", result=result)
+            return _mark_truncated(make_response(render_template("scan.html", result=result)), truncated)
 
     return render_template("scan.html")
 
 
 @main.route("/scan_api", methods=["POST"])
 def scan_api():
-    global logs
     data = request.get_json() or {}
-    email_text = data.get("email_text", "").strip()
+    email_text, truncated = _clip_email(data.get("email_text", ""))
+    email_text = email_text.strip()
 
     if not email_text:
         return jsonify({"error": "No email provided"}), 400
 
-    result = process_email(
+    future = current_app.executor.submit(
+        cached_process,
         email_text=email_text,
         ip_address=request.remote_addr or "unknown",
         user_agent=request.headers.get("User-Agent", "unknown")
     )
+    try:
+        result = future.result(timeout=10)
+    except ScanTimeout:
+        return jsonify({"error": "Scan timed out"}), 504
 
     
     logs.append({
-        "id": len(logs) + 1,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": _now_str_cached(),
         "label": result["label"],
         "confidence": result.get("confidence"),
         "reason": result["reason"]
     })
 
-    return jsonify({
+    return _mark_truncated(jsonify({
         "label": result["label"],
         "confidence": result.get("confidence"),
         "reason": result["reason"]
-    })
+    }), truncated)
 
 
 @main.route("/logs")
 def logs_page():
-    stats = {
-        "total": len(logs),
-        "Phishing": sum(1 for log in logs if log["label"] == "Phishing"),
-        "Suspicious": sum(1 for log in logs if log["label"] == "Suspicious"),
-        "Safe": sum(1 for log in logs if log["label"] == "Safe")
-    }
-
-    return render_template("logs.html", logs=logs[::-1], stats=stats)  # Newest first
\ No newline at end of file
+    return render_template("logs.html", logs=logs.newest_first(), stats=logs.stats())  # Newest first
\ No newline at end of file
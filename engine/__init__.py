@@ -1,3 +1,7 @@
+import os
+import threading
+from typing import Optional
+
 from .chain import (
     BaseHandler,
     URLHandler,
@@ -18,7 +22,9 @@ from .logger import (
 
 from .extractor_url import (
     extract_urls,
-    url_features
+    iter_urls,
+    url_features,
+    has_url_hint
 )
 
 from .model_loader import (
@@ -30,10 +36,25 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 
 
-try:
-    init_db()
-except Exception:
-    pass  
+_warmup_lock = threading.Lock()
+_warmup_pid: Optional[int] = None
+
+
+def warmup() -> None:
+    # Process start-up I/O lives here rather than at import time so importing
+    # the package stays cheap. Keyed on the pid so repeated calls (several
+    # create_app() calls, tests) are no-ops while a forked worker still runs it.
+    global _warmup_pid
+    from ._scoring import warmup as warmup_scoring
+
+    with _warmup_lock:
+        if _warmup_pid == os.getpid():
+            return
+        init_db()
+        load_model()     # returns immediately, the pickle is read in the background
+        warmup_scoring()
+        _warmup_pid = os.getpid()
+
 
 __all__ = [
 
@@ -43,7 +64,9 @@ __all__ = [
   
     "init_db", "log_scan", "get_recent_logs", "get_stats",
    
-    "extract_urls", "url_features",
+    "extract_urls", "iter_urls", "url_features", "has_url_hint",
    
-    "load_model", "get_model"
+    "load_model", "get_model",
+
+    "warmup"
 ]
\ No newline at end of file
@@ -0,0 +1,95 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.05  # seconds
+MAX_PENDING = 10000
+
+_Q: "queue.Queue[Tuple]" = queue.Queue(maxsize=MAX_PENDING)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _collect(first: Tuple) -> List[Tuple]:
+    batch = [first]
+    deadline = time.monotonic() + FLUSH_INTERVAL
+    while len(batch) < BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_Q.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _write(batch: List[Tuple]) -> None:
+    from .logger import get_conn, INSERT_SQL
+
+    conn = get_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")  # take the write lock up front
+        conn.executemany(INSERT_SQL, batch)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _run() -> None:
+    while True:
+        batch = _collect(_Q.get())
+        try:
+            _write(batch)
+        except Exception as e:
+            print(f"[LogWriter] Failed to write {len(batch)} log rows: {e}")
+        finally:
+            for _ in batch:
+                _Q.task_done()
+
+
+def _ensure_writer() -> None:
+    # is_alive() rather than "is not None": a forked child inherits the
+    # reference but not the thread, so the writer has to be started again
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_run, name="log-writer", daemon=True)
+            _writer.start()
+
+
+def submit(row: Tuple) -> None:
+    _ensure_writer()
+    try:
+        _Q.put_nowait(row)
+    except queue.Full:
+        # The writer is behind; write this row inline rather than drop it
+        _write([row])
+
+
+def flush() -> None:
+    # Without a live writer nothing would ever mark the rows done
+    if _writer is not None and _writer.is_alive():
+        _Q.join()
+
+
+def _reset_after_fork() -> None:
+    # Rows queued by the parent are the parent's to write, and the inherited
+    # queue's condition still waits on the parent's writer. Start from scratch.
+    global _Q, _writer, _writer_lock
+    _Q = queue.Queue(maxsize=MAX_PENDING)
+    _writer = None
+    _writer_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+atexit.register(flush)
@@ -0,0 +1,31 @@
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _score_py(length: int, dots: int, keywords: int, ip: int, tld: int,
+              shortener: int, specials: int, no_https: int, uppercase: int) -> float:
+    risk = 0.0
+    risk += length * 0.28
+    risk += dots * 0.22
+    risk += keywords * 0.38
+    risk += ip * 0.65
+    risk += tld * 0.48
+    risk += shortener * 0.50
+    risk += specials * 0.24
+    risk += no_https * 0.18
+    risk += uppercase * 0.15
+    return risk
+
+
+if numba is not None:
+    # No explicit signature: numba compiles lazily on the first call, which is
+    # warmup() at app start-up rather than the import of this module
+    _score = numba.njit(cache=True)(_score_py)
+else:
+    _score = _score_py
+
+
+def warmup() -> None:
+    _score(0, 0, 0, 0, 0, 0, 0, 0, 0)
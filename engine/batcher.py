@@ -0,0 +1,102 @@
+import os
+import queue
+import threading
+import time
+from typing import Any, List, Optional
+from .model_loader import get_model
+
+
+BATCH_SIZE = 32
+BATCH_WINDOW = 0.005  # seconds to wait for more requests after the first one
+QUEUE_TIMEOUT = 30.0  # seconds a request may wait for the worker to pick it up
+
+_queue: "queue.Queue[_Pending]" = queue.Queue()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+class _Pending:
+    __slots__ = ("text", "started", "event", "result", "error", "abandoned")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.started = threading.Event()
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.abandoned = False
+
+
+def _run() -> None:
+    while True:
+        batch: List[_Pending] = [_queue.get()]
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # Skip requests whose caller already gave up waiting in the queue
+        batch = [p for p in batch if not p.abandoned]
+        if not batch:
+            continue
+        for p in batch:
+            p.started.set()
+
+        try:
+            probs = get_model().predict_proba([p.text for p in batch])
+            for p, proba in zip(batch, probs):
+                p.result = proba
+        except Exception as e:
+            for p in batch:
+                p.error = e
+        finally:
+            for p in batch:
+                p.event.set()
+
+
+def _ensure_worker() -> None:
+    # is_alive() rather than "is not None": a forked child inherits the
+    # reference but not the thread, so the worker has to be started again
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="model-batcher", daemon=True)
+            _worker.start()
+
+
+def _reset_after_fork() -> None:
+    # The inherited queue's condition still lists the parent's (now gone) worker
+    # as a waiter, so a put() in the child would wake nobody. Start from scratch.
+    global _queue, _worker, _worker_lock
+    _queue = queue.Queue()
+    _worker = None
+    _worker_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def predict_proba(text: str, timeout: float = 2.0, queue_timeout: float = QUEUE_TIMEOUT) -> Any:
+    # Block on a still-loading model here so the load time doesn't count against the timeout
+    get_model()
+    _ensure_worker()
+    pending = _Pending(text)
+    _queue.put(pending)
+
+    # The timeout covers inference only; time queued behind earlier batches has its
+    # own, longer bound so a stalled worker still ends in an error instead of a hang
+    if not pending.started.wait(queue_timeout):
+        pending.abandoned = True
+        raise TimeoutError(f"Model worker did not pick up the request within {queue_timeout}s")
+    if not pending.event.wait(timeout):
+        raise TimeoutError(f"Model inference timed out after {timeout}s")
+    if pending.error is not None:
+        raise pending.error
+    return pending.result
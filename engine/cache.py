@@ -0,0 +1,88 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from .processor import process_email
+from .logger import log_scan
+
+
+CACHE_SIZE = 4096
+
+_cache: "OrderedDict[bytes, Tuple[str, Optional[float], str]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_hits = 0
+_misses = 0
+_generation = 0  # bumped by clear_cache() so verdicts computed before it are dropped
+
+
+def _digest(email_text: str) -> bytes:
+    return hashlib.blake2b(email_text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def cached_process(
+    email_text: str,
+    ip_address: str = "unknown",
+    user_agent: str = "unknown"
+) -> Dict[str, Any]:
+
+    global _hits, _misses
+
+    key = _digest(email_text)
+
+    with _cache_lock:
+        generation = _generation
+        verdict = _cache.get(key)
+        if verdict is not None:
+            _cache.move_to_end(key)
+            _hits += 1
+        else:
+            _misses += 1
+
+    if verdict is not None:
+        label, confidence, reason = verdict
+        log_scan(
+            email_text=email_text,
+            label=label,
+            confidence=confidence if confidence else None,
+            reason=reason,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        return {"label": label, "confidence": confidence, "reason": reason}
+
+    result = process_email(
+        email_text=email_text,
+        ip_address=ip_address,
+        user_agent=user_agent
+    )
+
+    # Engine failures and the "model unavailable" fallback are transient,
+    # so only real verdicts (non-zero confidence) are memoized
+    if result["label"] != "Error" and result.get("confidence"):
+        with _cache_lock:
+            # Skip results from a model/chain that was replaced mid-scan
+            if generation == _generation:
+                _cache[key] = (result["label"], result.get("confidence"), result["reason"])
+                if len(_cache) > CACHE_SIZE:
+                    _cache.popitem(last=False)
+
+    return result
+
+
+def cache_info() -> Dict[str, int]:
+    with _cache_lock:
+        return {
+            "hits": _hits,
+            "misses": _misses,
+            "maxsize": CACHE_SIZE,
+            "currsize": len(_cache)
+        }
+
+
+def clear_cache() -> None:
+    global _hits, _misses, _generation
+    with _cache_lock:
+        _cache.clear()
+        _generation += 1
+        _hits = 0
+        _misses = 0
@@ -1,9 +1,20 @@
 import re
-import email
+from email.parser import HeaderParser
 from email.utils import parseaddr
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set, Tuple
 from .extractor_url import url_features
-from .model_loader import get_model
+from .batcher import predict_proba
+from ._scoring import _score
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+_ADDR_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+_NESTED_RE = re.compile(r"@[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+")
+_HEADER_PARSER = HeaderParser()
 
 
 class BaseHandler:
@@ -22,20 +33,25 @@ class URLHandler(BaseHandler):
     }
 
     def handle(self, email_text: str) -> Optional[Dict[str, Any]]:
+        # url_features() already short-circuits texts without a URL to all zeros
         feats = url_features(email_text)
+        if not any(feats):
+            return self.successor.handle(email_text) if self.successor else None
+
         length, dots, at_sym, no_https, keywords, ip, tld, shortener, specials, uppercase = feats
 
 
-        risk = 0.0
-        risk += (length > self.THRESHOLDS['length']) * 0.28
-        risk += (dots > self.THRESHOLDS['dots']) * 0.22
-        risk += keywords * 0.38
-        risk += ip * 0.65
-        risk += tld * 0.48
-        risk += shortener * 0.50
-        risk += (specials > self.THRESHOLDS['specials']) * 0.24
-        risk += no_https * 0.18
-        risk += uppercase * 0.15
+        risk = _score(
+            int(length > self.THRESHOLDS['length']),
+            int(dots > self.THRESHOLDS['dots']),
+            keywords,
+            ip,
+            tld,
+            shortener,
+            int(specials > self.THRESHOLDS['specials']),
+            no_https,
+            uppercase
+        )
 
         if risk > 0.58:
             return {
@@ -63,9 +79,41 @@ class HeaderHandler(BaseHandler):
         "bankofamerica": ["bank0famerica", "bofa-secure"]
     }
 
+    _BRANDS = tuple(BRAND_IMPERSONATION)
+    _BRAND_SUFFIX = {brand: f"{brand}.com" for brand in BRAND_IMPERSONATION}
+    _PATTERN_BRAND = {
+        pattern: brand
+        for brand, patterns in BRAND_IMPERSONATION.items()
+        for pattern in patterns
+    }
+    _BRAND_PATTERN_RE = re.compile("|".join(re.escape(p) for p in _PATTERN_BRAND))
+
+    def _scan_brands(self, domain_lower: str) -> Tuple[Set[str], Set[str]]:
+        brands: Set[str] = set()
+        patterns: Set[str] = set()
+        if ahocorasick is not None:
+            for _, (kind, word) in _BRAND_AC.iter(domain_lower):
+                (brands if kind == "brand" else patterns).add(word)
+        else:
+            brands.update(b for b in self._BRANDS if b in domain_lower)
+            patterns.update(m.group(0) for m in self._BRAND_PATTERN_RE.finditer(domain_lower))
+        return brands, patterns
+
     def handle(self, email_text: str) -> Optional[Dict[str, Any]]:
         try:
-            msg = email.message_from_string(email_text)
+            # Cheap guard: skip the parser when no From header can possibly be present.
+            # Headers always sit in the prefix, so only the first 8 KB are inspected.
+            prefix = email_text[:8192].lower()
+            prefix_end = prefix.find("\n\n")
+            if prefix_end != -1:
+                prefix = prefix[:prefix_end]
+            if (prefix_end != -1 or len(email_text) <= 8192) and "from:" not in prefix:
+                return {"label": "Phishing", "confidence": 0.94, "reason": "Missing From header"}
+
+            # Only the header block is needed, so never hand the body to the parser
+            header_end = email_text.find("\n\n")
+            header_block = email_text[:header_end + 1] if header_end != -1 else email_text
+            msg = _HEADER_PARSER.parsestr(header_block)
             sender = msg.get("From", "").strip()
 
             if not sender:
@@ -78,7 +126,7 @@ class HeaderHandler(BaseHandler):
             addr = addr.lower()
             domain = addr.split("@")[-1] if "@" in addr else ""
 
-            if not re.match(r"^[^@]+@[^@]+\.[^@]+$", addr):
+            if not _ADDR_RE.match(addr):
                 return {"label": "Phishing", "confidence": 0.89, "reason": f"Malformed email address: {addr}"}
 
 
@@ -86,23 +134,24 @@ class HeaderHandler(BaseHandler):
                 return {"label": "Phishing", "confidence": 0.90, "reason": f"Suspicious domain TLD: {domain}"}
 
             domain_lower = domain.lower()
-            for brand, patterns in self.BRAND_IMPERSONATION.items():
-                if brand in domain_lower:
-                    if not domain_lower.endswith(f"{brand}.com"):
-                        return {
-                            "label": "Phishing",
-                            "confidence": 0.97,
-                            "reason": f"Brand impersonation detected: {domain} (spoofing {brand}.com)"
-                        }
-                for pattern in patterns:
-                    if pattern in domain_lower:
+            brands_found, patterns_found = self._scan_brands(domain_lower)
+
+            for brand in self._BRANDS:
+                if brand in brands_found and not domain_lower.endswith(self._BRAND_SUFFIX[brand]):
+                    return {
+                        "label": "Phishing",
+                        "confidence": 0.97,
+                        "reason": f"Brand impersonation detected: {domain} (spoofing {brand}.com)"
+                    }
+                for pattern in self.BRAND_IMPERSONATION[brand]:
+                    if pattern in patterns_found:
                         return {
                             "label": "Phishing",
                             "confidence": 0.98,
                             "reason": f"Known phishing pattern in domain: {pattern} → {domain}"
                         }
 
-            if re.search(r"@[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+", sender):
+            if _NESTED_RE.search(sender):
                 return {"label": "Phishing", "confidence": 0.87, "reason": "Nested/obfuscated domain in sender"}
 
             return self.successor.handle(email_text) if self.successor else None
@@ -112,11 +161,19 @@ class HeaderHandler(BaseHandler):
             return self.successor.handle(email_text) if self.successor else None
 
 
+if ahocorasick is not None:
+    _BRAND_AC = ahocorasick.Automaton()
+    for _brand, _patterns in HeaderHandler.BRAND_IMPERSONATION.items():
+        _BRAND_AC.add_word(_brand, ("brand", _brand))
+        for _pattern in _patterns:
+            _BRAND_AC.add_word(_pattern, ("pattern", _pattern))
+    _BRAND_AC.make_automaton()
+
+
 class ModelHandler(BaseHandler):
     def handle(self, email_text: str) -> Dict[str, Any]:
         try:
-            model = get_model()
-            proba = model.predict_proba([email_text])[0]
+            proba = predict_proba(email_text)
             phish_prob = proba[1]
 
             if phish_prob >= 0.78:
@@ -137,6 +194,10 @@ class ModelHandler(BaseHandler):
                     "confidence": round(phish_prob, 4),
                     "reason": f"ML Model uncertain ({phish_prob:.1%} phishing probability)"
                 }
+        except TimeoutError as e:
+            # The email was never scored, so it must not be reported as Safe
+            print(f"[ModelHandler] Error: {e}")
+            return {"label": "Error", "confidence": 0.0, "reason": "ML model timed out"}
         except Exception as e:
             print(f"[ModelHandler] Error: {e}")
             return {"label": "Safe", "confidence": 0.0, "reason": "ML model unavailable"}
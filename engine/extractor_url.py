@@ -1,9 +1,20 @@
 import re
-from urllib.parse import urlparse, unquote
-from typing import List
+import threading
+from urllib.parse import unquote
+from typing import List, Iterator
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 
 SUSPICIOUS_TLDS = {
     "ru", "cn", "tk", "top", "xyz", "zip", "biz", "pw", "info", "ga", "gq", "ml",
@@ -22,50 +33,176 @@ SUSPICIOUS_KEYWORDS = {
     "ebay", "paypal", "amazon", "apple", "microsoft", "netflix", "crypto"
 }
 
-
-def extract_urls(text: str) -> List[str]:
+_URL_RE = re.compile(r'(https?://[^\s<>"\']+|www\.[^\s<>"\']+)', re.IGNORECASE)
+_WWW_RE = re.compile(r"[wW]{3}\.")
+_WWW_TAILS = ("ww.", "wW.", "Ww.", "WW.")
+_NETLOC_RE = re.compile(r"https?://([^/?#]*)")
+_IP_RE = re.compile(r"\d+\.\d+\.\d+\.\d+")
+_SPECIALS_RE = re.compile(r"[-_?=&%+/]")
+_KEYWORDS_RE = re.compile("|".join(map(re.escape, sorted(SUSPICIOUS_KEYWORDS))))
+_SHORTENER_RE = re.compile("|".join(map(re.escape, sorted(SHORTENER_DOMAINS))))
+_NOT_UPPER = bytes(i for i in range(256) if not 65 <= i <= 90)  # deletes everything but A-Z
+
+# Keywords and shorteners share one automaton; each word is tagged with its
+# bucket and length so a hit can be placed inside or outside the domain
+_BUCKET_KEYWORD, _BUCKET_SHORTENER = range(2)
+
+if ahocorasick is not None:
+    _URL_AC = ahocorasick.Automaton()
+    for _keyword in SUSPICIOUS_KEYWORDS:
+        _URL_AC.add_word(_keyword, (_BUCKET_KEYWORD, len(_keyword)))
+    for _shortener in SHORTENER_DOMAINS:
+        _URL_AC.add_word(_shortener, (_BUCKET_SHORTENER, len(_shortener)))
+    _URL_AC.make_automaton()
+
+# One multi-pattern database for the per-URL flags. Every pattern is anchored
+# on the scheme where needed so that it only looks at the domain, which makes
+# each one equivalent to the regex/set check it replaces in _url_flags().
+_HS_KEYWORD, _HS_IP, _HS_BAD_TLD, _HS_SHORTENER = range(4)
+
+if hyperscan is not None:
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[
+            "|".join(map(re.escape, sorted(SUSPICIOUS_KEYWORDS))).encode(),
+            rb"^https?://\d+\.\d+\.\d+\.\d+",
+            (r"^https?://(?:[^/?#]*\.)?(?:" + "|".join(sorted(SUSPICIOUS_TLDS)) + r")(?:[/?#]|$)").encode(),
+            (r"^https?://[^/?#]*(?:" + "|".join(map(re.escape, sorted(SHORTENER_DOMAINS))) + ")").encode(),
+        ],
+        ids=[_HS_KEYWORD, _HS_IP, _HS_BAD_TLD, _HS_SHORTENER],
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * 4
+    )
+
+
+# The database's built-in scratch can only serve one scan at a time and
+# hs_scan runs without the GIL, so every thread gets its own scratch space
+_hs_local = threading.local()
+
+
+def _hs_scratch() -> "hyperscan.Scratch":
+    scratch = getattr(_hs_local, "scratch", None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+    return scratch
+
+
+def _on_hs_match(pattern_id: int, start: int, end: int, flags: int, hits: list) -> None:
+    hits[pattern_id] = 1
+
+
+def _url_flags(url: str) -> list:
+    # [keyword, ip, bad_tld, shortener] for a URL that starts with http(s)://
+    if hyperscan is not None and url.isascii():
+        hits = [0, 0, 0, 0]
+        _HS_DB.scan(url.encode("ascii"), match_event_handler=_on_hs_match, context=hits, scratch=_hs_scratch())
+        return hits
+
+    netloc = _NETLOC_RE.match(url)
+    domain = netloc.group(1)
+
+    if ahocorasick is not None:
+        keyword = shortener = False
+        domain_start, domain_end = netloc.span(1)
+        for end, (bucket, length) in _URL_AC.iter(url):
+            if bucket == _BUCKET_KEYWORD:
+                keyword = True
+            elif end - length + 1 >= domain_start and end < domain_end:
+                shortener = True
+            if keyword and shortener:
+                break
+    else:
+        keyword = _KEYWORDS_RE.search(url) is not None
+        shortener = _SHORTENER_RE.search(domain) is not None
+
+    return [
+        keyword,
+        _IP_RE.match(domain) is not None,
+        domain.rpartition(".")[2] in SUSPICIOUS_TLDS,
+        shortener
+    ]
+
+
+def _has_upper(url: str) -> bool:
+    # unquote() runs after lower(), so a percent escape can bring back any
+    # uppercase letter, ASCII or not; only pure-ASCII URLs take the fast path
+    if url.isascii():
+        return bool(url.encode('ascii').translate(None, _NOT_UPPER))
+    return any(c.isupper() for c in url if c.isalpha())
+
+
+def has_url_hint(text: str) -> bool:
+    # Every URL extract_urls() can match contains "://" or a www. in any case.
+    # Plain substring tests rule out most texts before the regex has to scan them.
+    if "://" in text:
+        return True
+    return any(tail in text for tail in _WWW_TAILS) and _WWW_RE.search(text) is not None
+
+
+def iter_urls(text: str) -> Iterator[str]:
 
     if not text:
-        return []
-    pattern = r'(https?://[^\s<>"\']+|www\.[^\s<>"\']+)'
-    urls = re.findall(pattern, text, re.IGNORECASE)
-    return [unquote(u.strip().lower()) for u in urls]
+        return
+    seen = set()
+    # Matches can't contain whitespace, so there is nothing to strip
+    for match in _URL_RE.finditer(text):
+        url = unquote(match.group(0).lower())
+        if url not in seen:
+            seen.add(url)
+            yield url
+
+
+def extract_urls(text: str) -> List[str]:
+    return list(iter_urls(text))
 
 
 def url_features(text: str) -> list:
 
-    urls = extract_urls(text)
-    if not urls:
+    if not text or not has_url_hint(text):
         return [0] * 10
 
-    features_per_url = []
+    urls = iter_urls(text)
+    max_length = max_dots = max_specials = 0
+    has_at = has_no_https = has_keyword = has_ip = has_bad_tld = is_shortener = has_upper = 0
+
     for url in urls:
-        try:
-        
-            if not url.startswith(("http://", "https://")):
-                url = "http://" + url
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            path_query = (parsed.path + parsed.query).lower()
-
-          
-            features_per_url.append([
-                len(url),                                    
-                url.count('.'),                        
-                int('@' in url),                        
-                int(not url.startswith("https://")),       
-                int(any(k in url for k in SUSPICIOUS_KEYWORDS)),  
-                int(bool(re.match(r"\d+\.\d+\.\d+\.\d+", domain))),  
-                int(domain.split(".")[-1] in SUSPICIOUS_TLDS),       
-                int(any(s in domain for s in SHORTENER_DOMAINS)),    
-                len(re.findall(r'[-_?=&%+/]', url)),         
-                int(any(c.isupper() for c in url if c.isalpha()))   
-            ])
-        except Exception:
-            features_per_url.append([0] * 10)
-
-
-    return list(map(max, zip(*features_per_url)))
+        if not url.startswith(("http://", "https://")):
+            url = "http://" + url
+        keyword, ip, bad_tld, shortener = _url_flags(url)
+
+        max_length = max(max_length, len(url))
+        max_dots = max(max_dots, url.count('.'))
+        max_specials = max(max_specials, len(_SPECIALS_RE.findall(url)))
+        has_at = has_at or '@' in url
+        has_no_https = has_no_https or not url.startswith("https://")
+        has_keyword = has_keyword or keyword
+        has_ip = has_ip or ip
+        has_bad_tld = has_bad_tld or bad_tld
+        is_shortener = is_shortener or shortener
+        has_upper = has_upper or _has_upper(url)
+
+        if has_at and has_no_https and has_keyword and has_ip and has_bad_tld and is_shortener:
+            # Every domain/keyword flag is set, skip those checks for the remaining URLs
+            for rest in urls:
+                if not rest.startswith(("http://", "https://")):
+                    rest = "http://" + rest
+                max_length = max(max_length, len(rest))
+                max_dots = max(max_dots, rest.count('.'))
+                max_specials = max(max_specials, len(_SPECIALS_RE.findall(rest)))
+                has_upper = has_upper or _has_upper(rest)
+            break
+
+    return [
+        max_length,
+        max_dots,
+        int(has_at),
+        int(has_no_https),
+        int(has_keyword),
+        int(has_ip),
+        int(has_bad_tld),
+        int(is_shortener),
+        max_specials,
+        int(has_upper)
+    ]
 
 
 
@@ -73,4 +210,4 @@ class URLFeatureExtractor(BaseEstimator, TransformerMixin):
     def fit(self, X, y=None):
         return self
     def transform(self, X):
-        return np.array([url_features(text) for text in X])
\ No newline at end of file
+        return np.array([url_features(text) for text in X])
@@ -1,20 +1,46 @@
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Optional
+from . import _log_writer
 
 
 DB_DIR = "data"
 DB_PATH = os.path.join(DB_DIR, "database.db")
 os.makedirs(DB_DIR, exist_ok=True)
 
+# The timestamp is filled in by SQLite (local time, same format as before)
+INSERT_SQL = """
+INSERT INTO email_logs
+    (timestamp, email_text, label, confidence, reason, ip_address, user_agent)
+VALUES (strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'), ?, ?, ?, ?, ?, ?)
+"""
+
+_STATS_TEMPLATE = {
+    "total": 0,
+    "Phishing": 0,
+    "Safe": 0,
+    "Suspicious": 0,
+    "Error": 0
+}
+
+_tls = threading.local()
 
 
 def get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=10.0)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")   # Better concurrency
-    conn.execute("PRAGMA foreign_keys=ON")
+    # One connection per thread, opened and configured on first use.
+    # "with get_conn() as conn" only scopes a transaction, it doesn't close it.
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=10.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")   # Better concurrency
+        conn.execute("PRAGMA synchronous=NORMAL")  # no fsync per commit, still safe under WAL
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8000")    # 8 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA foreign_keys=ON")
+        _tls.conn = conn
     return conn
 
 
@@ -35,6 +61,30 @@ def init_db() -> None:
 
     CREATE INDEX IF NOT EXISTS idx_timestamp ON email_logs(timestamp DESC);
     CREATE INDEX IF NOT EXISTS idx_label ON email_logs(label);
+
+    -- Per-label row counts kept current by triggers, so get_stats never scans the logs
+    CREATE TABLE IF NOT EXISTS label_counts (
+        label TEXT PRIMARY KEY,
+        n INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TRIGGER IF NOT EXISTS trg_log_ins AFTER INSERT ON email_logs
+    BEGIN
+        INSERT INTO label_counts(label, n) VALUES (NEW.label, 1)
+        ON CONFLICT(label) DO UPDATE SET n = n + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_log_del AFTER DELETE ON email_logs
+    BEGIN
+        UPDATE label_counts SET n = n - 1 WHERE label = OLD.label;
+    END;
+
+    -- Seeds the counts for logs written before the triggers existed; once they
+    -- do, every logged label already has a row and both inserts are no-ops
+    INSERT OR IGNORE INTO label_counts(label, n)
+        SELECT label, COUNT(*) FROM email_logs GROUP BY label;
+    INSERT OR IGNORE INTO label_counts(label)
+        VALUES ('Phishing'), ('Suspicious'), ('Safe'), ('Error');
     """
 
     with get_conn() as conn:
@@ -49,42 +99,33 @@ def log_scan(
     reason: str = "",
     ip_address: str = "unknown",
     user_agent: str = "unknown"
-) -> int:
-
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+) -> None:
 
-    truncated_email = email_text[:1500] + ("..." if len(email_text) > 1500 else "")
+    truncated_email = email_text if len(email_text) <= 1500 else email_text[:1500] + "..."
 
-    insert_sql = """
-    INSERT INTO email_logs
-        (timestamp, email_text, label, confidence, reason, ip_address, user_agent)
-    VALUES (?, ?, ?, ?, ?, ?, ?)
-    """
-
-    with get_conn() as conn:
-        cursor = conn.execute(insert_sql, (
-            timestamp,
-            truncated_email,
-            label,
-            confidence,
-            reason or "",
-            ip_address,
-            user_agent
-        ))
-        conn.commit()
-        return cursor.lastrowid
+    # Rows are committed in batches by the background writer (see _log_writer)
+    _log_writer.submit((
+        truncated_email,
+        label,
+        confidence,
+        reason or "",
+        ip_address,
+        user_agent
+    ))
 
 
-def get_recent_logs(limit: int = 50) -> List[Dict[str, Any]]:
+def get_recent_logs(limit: int = 50) -> List[sqlite3.Row]:
 
     limit = min(max(limit, 1), 1000) 
 
+    # sqlite3.Row already supports row["column"], keys() and dict(row),
+    # so the rows are handed out as-is instead of copied into dicts
     with get_conn() as conn:
         cursor = conn.execute(
             "SELECT * FROM email_logs ORDER BY id DESC LIMIT ?",
             (limit,)
         )
-        logs = [dict(row) for row in cursor.fetchall()]
+        logs = cursor.fetchall()
     return logs
 
 
@@ -92,20 +133,14 @@ def get_stats() -> Dict[str, int]:
 
     with get_conn() as conn:
         cursor = conn.execute("""
-            SELECT label, COUNT(*) as count
-            FROM email_logs
-            GROUP BY label
+            SELECT label, n as count
+            FROM label_counts
+            ORDER BY label
         """)
         rows = cursor.fetchall()
 
   
-        stats = {
-            "total": 0,
-            "Phishing": 0,
-            "Safe": 0,
-            "Suspicious": 0,
-            "Error": 0
-        }
+        stats = _STATS_TEMPLATE.copy()
 
         total = 0
         for row in rows:
@@ -127,6 +162,3 @@ def clear_logs() -> None:
         conn.execute("VACUUM")
         conn.commit()
     print("All logs cleared.")
-
-
-init_db()  
\ No newline at end of file
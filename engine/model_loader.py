@@ -1,29 +1,55 @@
 import joblib
 import os
 import threading
-from typing import Optional, Any
+import numpy as np
+from typing import Optional, Any, Iterable
 from pathlib import Path
 
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
 MODEL_DIR = Path("model")
 MODEL_PATH = MODEL_DIR / "phishing_model_full.pkl"
+ONNX_MODEL_PATH = MODEL_DIR / "phishing_model_full.onnx"
 FALLBACK_MODEL_PATH = MODEL_DIR / "phishing_model.pkl" 
 
+# Opt-in: serve the exported ONNX graph instead of the pickle
+USE_ONNX = os.getenv("PHISHING_SHIELD_ONNX", "0") == "1"
+
 _model: Optional[Any] = None
-_model_lock = threading.Lock()  
+_model_lock = threading.RLock()  # reentrant: reload_model() calls load_model() while holding it
+_model_ready = threading.Event()
+_load_thread: Optional[threading.Thread] = None
+_load_error: Optional[Exception] = None
 
 
-def load_model() -> Any:
+class OnnxModel:
+    # Wraps an ONNX Runtime session exported by model/export_onnx.py behind
+    # the same predict_proba() interface as the scikit-learn Pipeline
 
-    global _model
+    def __init__(self, path: Path):
+        so = ort.SessionOptions()
+        so.intra_op_num_threads = os.cpu_count() or 1
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(str(path), sess_options=so, providers=["CPUExecutionProvider"])
+        self._input = self._session.get_inputs()[0].name
 
-    if _model is not None:
-        return _model  
+    def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
+        # The graph's "C" locale only lowercases ASCII, so apply Python's lower() first
+        batch = np.array([text.lower() for text in texts], dtype=object).reshape(-1, 1)
+        return self._session.run(["probabilities"], {self._input: batch})[0]
 
-    with _model_lock:
-        if _model is not None:
-            return _model
 
-        if not MODEL_PATH.exists():
+def _do_load() -> None:
+
+    global _model, _load_error
+
+    try:
+        if USE_ONNX and ort is not None and ONNX_MODEL_PATH.exists():
+            model_file = ONNX_MODEL_PATH
+        elif not MODEL_PATH.exists():
             if FALLBACK_MODEL_PATH.exists():
                 print(f"[WARNING] Main model not found, using fallback: {FALLBACK_MODEL_PATH}")
                 model_file = FALLBACK_MODEL_PATH
@@ -39,27 +65,56 @@ def load_model() -> Any:
 
         try:
             print(f"[+] Loading phishing detection model from: {model_file}")
-            _model = joblib.load(model_file)
+            if model_file == ONNX_MODEL_PATH:
+                model = OnnxModel(model_file)
+            else:
+                # Arrays are mapped read-only straight from the (uncompressed) pickle
+                model = joblib.load(model_file, mmap_mode="r")
 
 
-            if not hasattr(_model, "predict_proba"):
+            if not hasattr(model, "predict_proba"):
                 raise ValueError("Loaded object is not a valid scikit-learn model (missing predict_proba)")
 
-            print(f"[Success] Model loaded successfully → {type(_model).__name__}")
-            return _model
+            _model = model
+            _load_error = None
+            print(f"[Success] Model loaded successfully → {type(model).__name__}")
 
         except Exception as e:
             print(f"[ERROR] Failed to load model: {e}")
             raise RuntimeError(f"Could not load phishing model from {model_file}") from e
 
+    except Exception as e:
+        _load_error = e
+
+    finally:
+        _model_ready.set()
+
+
+def load_model() -> None:
+    global _load_thread
+
+    with _model_lock:
+        if _model is not None:
+            return
+        if _load_thread is not None and _load_thread.is_alive():
+            return
+
+        _model_ready.clear()
+        _load_thread = threading.Thread(target=_do_load, name="model-loader", daemon=True)
+        _load_thread.start()
+
 
 def get_model() -> Any:
 
-    global _model
+    model = _model
+    if model is not None:
+        return model
+
+    load_model()
+    _model_ready.wait()
+
     if _model is None:
-        with _model_lock:
-            if _model is None:
-                return load_model()
+        raise _load_error or RuntimeError("Phishing model is not loaded")
     return _model
 
 
@@ -67,21 +122,36 @@ def is_model_loaded() -> bool:
     return _model is not None
 
 
+def model_status() -> str:
+    # "error" only once a load attempt has finished and failed; a retry
+    # clears _model_ready, so it reads as "loading" again until it settles
+    if _model is not None:
+        return "ready"
+    if _model_ready.is_set() and _load_error is not None:
+        return "error"
+    return "loading"
+
+
+def model_error() -> Optional[str]:
+    error = _load_error
+    return str(error) if error is not None else None
+
+
 def reload_model() -> bool:
     global _model
     try:
+        # Reset and restart under one lock hold so no caller can see the
+        # cleared model without a load already being on its way
+        from .cache import clear_cache
+
         with _model_lock:
             _model = None
             load_model()
+        # Cached verdicts came from the old model
+        clear_cache()
+        get_model()
         print("[Success] Model reloaded successfully.")
         return True
     except Exception as e:
         print(f"[ERROR] Failed to reload model: {e}")
         return False
-
-
-if os.getenv("PHISHING_SHIELD_EAGER_LOAD", "1") == "1":
-    try:
-        load_model()
-    except Exception as e:
-        print(f"[WARNING] Model pre-load failed (will retry later): {e}")
\ No newline at end of file
@@ -1,10 +1,38 @@
 from typing import Dict, Any, Optional
-import uuid
-import traceback
-from .chain import build_chain
+import logging
+import secrets
+import threading
+from .chain import BaseHandler, build_chain
 from .logger import log_scan
 
 
+_log = logging.getLogger(__name__)
+
+_VALID_LABELS = frozenset(("Phishing", "Suspicious", "Safe", "Error"))
+
+_CHAIN: Optional[BaseHandler] = None
+_CHAIN_LOCK = threading.Lock()
+
+
+def _get_chain() -> BaseHandler:
+    # Handlers hold no per-request state, so one chain is shared by all scans
+    global _CHAIN
+    if _CHAIN is None:
+        with _CHAIN_LOCK:
+            if _CHAIN is None:
+                _CHAIN = build_chain()
+    return _CHAIN
+
+
+def reset_chain() -> None:
+    global _CHAIN
+    from .cache import clear_cache
+
+    with _CHAIN_LOCK:
+        _CHAIN = None
+    clear_cache()
+
+
 def process_email(
     email_text: str,
     request_id: Optional[str] = None,
@@ -12,12 +40,15 @@ def process_email(
     user_agent: str = "unknown"
 ) -> Dict[str, Any]:
 
-    if not email_text or not email_text.strip():
+    req_id = request_id or secrets.token_hex(16)
+
+    # isspace() is the copy-free form of "not strip()"; it is False for ""
+    if not email_text or email_text.isspace():
         result = {
             "label": "Error",
             "confidence": 0.0,
             "reason": "Empty or invalid email content",
-            "request_id": request_id or str(uuid.uuid4()),
+            "request_id": req_id,
             "quarantined": False
         }
         log_scan(email_text="", label="Error", reason=result["reason"])
@@ -28,15 +59,16 @@ def process_email(
             "label": "Error",
             "confidence": 0.0,
             "reason": "Email too large (>500KB)",
-            "request_id": request_id or str(uuid.uuid4()),
+            "request_id": req_id,
             "quarantined": False
         }
         log_scan(email_text="[TOO LARGE]", label="Error", reason=result["reason"])
         return result
 
     try:
-        chain = build_chain()
-        raw_result = chain.handle(email_text.strip())
+        chain = _get_chain()
+        stripped = email_text.strip()
+        raw_result = chain.handle(stripped)
 
         if raw_result is None:
             raw_result = {
@@ -46,7 +78,7 @@ def process_email(
             }
 
     except Exception as e:
-        traceback.print_exc()
+        _log.exception("Detection chain failed: %s", e)
         raw_result = {
             "label": "Error",
             "confidence": 0.0,
@@ -58,13 +90,11 @@ def process_email(
     confidence = float(raw_result.get("confidence", 0.0))
     reason = str(raw_result.get("reason", "No reason provided")).strip()
 
-    valid_labels = {"Phishing", "Suspicious", "Safe", "Error"}
-    if label not in valid_labels:
+    if label not in _VALID_LABELS:
         label = "Safe"
         reason = f"Invalid label corrected: {raw_result.get('label')} → Safe"
 
     confidence = max(0.0, min(1.0, confidence))
-    req_id = request_id or str(uuid.uuid4())
 
     result = {
         "label": label,
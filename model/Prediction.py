@@ -1,15 +1,27 @@
 import re
 import numpy as np
 import joblib
+import os
 import sys
 
+MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "phishing_model_full.pkl")
+_model = None
+
+
+def _get_model():
+    # Deserialize once per process instead of on every prediction
+    global _model
+    if _model is None:
+        _model = joblib.load(MODEL_FILE, mmap_mode="r")
+    return _model
+
 def predict_email(text, thresholds=(0.7, 0.3)):
    
     try:
-        if not text or not isinstance(text, str):
+        if not text or not isinstance(text, str) or len(text) < 3:
             return None, None
         
-        model = joblib.load("phishing_model_full.pkl")
+        model = _get_model()
         proba = model.predict_proba([text])[0]
         phish_prob = proba[1] 
         
@@ -0,0 +1,91 @@
+import sys
+import joblib
+import numpy as np
+import pandas as pd
+import onnx
+from onnx import helper, numpy_helper
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import StringTensorType
+
+
+def fix_sublinear_tf(onx):
+    # skl2onnx emits log(tf + 1) for sublinear_tf, scikit-learn computes
+    # 1 + log(tf) on non-zero counts. Rewrite Add -> Log into
+    # Where(tf > 0, Log(tf) + 1, tf) so the TF-IDF weights match exactly.
+    graph = onx.graph
+    nodes = list(graph.node)
+    for add in nodes:
+        if add.op_type != "Add" or not add.input[1].startswith("ones"):
+            continue
+        log = next(n for n in nodes if n.op_type == "Log" and n.input[0] == add.output[0])
+        tf, ones = add.input
+        graph.initializer.append(numpy_helper.from_array(np.array([0], dtype=np.float32), "sublinear_zero"))
+        replacement = [
+            helper.make_node("Log", [tf], ["sublinear_log"]),
+            helper.make_node("Add", ["sublinear_log", ones], ["sublinear_plus1"]),
+            helper.make_node("Greater", [tf, "sublinear_zero"], ["sublinear_mask"]),
+            helper.make_node("Where", ["sublinear_mask", "sublinear_plus1", tf], [log.output[0]])
+        ]
+        position = nodes.index(add)
+        nodes = nodes[:position] + replacement + [n for n in nodes[position + 1:] if n is not log]
+        del graph.node[:]
+        graph.node.extend(nodes)
+        break
+    return onx
+
+
+model = joblib.load("phishing_model_full.pkl")
+tfidf = model.named_steps["tfidf"]
+clf = model.steps[-1][1]
+
+# ONNX Runtime tokenizes with RE2, where \w and \b are ASCII-only. Python's
+# (?u)\b\w\w+\b picks maximal runs of 2+ letters/digits/underscores, and \w
+# is exactly [\p{L}\p{N}_], so spell that out for RE2. The "C" locale avoids
+# depending on system language packs; its lowercasing is ASCII-only, which is
+# why OnnxModel in engine/model_loader.py lowercases the input itself.
+assert tfidf.token_pattern == r"(?u)\b\w\w+\b", "tokenexp below only mirrors the default token_pattern"
+options = {
+    id(tfidf): {"tokenexp": r"[\p{L}\p{N}_]{2,}", "locale": "C"},
+    id(clf): {"zipmap": False}
+}
+
+onx = convert_sklearn(
+    model,
+    initial_types=[("input", StringTensorType([None, 1]))],
+    options=options,
+    target_opset=17
+)
+if tfidf.sublinear_tf:
+    onx = fix_sublinear_tf(onx)
+onnx.checker.check_model(onx)
+
+
+import onnxruntime as ort
+
+# Parity check on real mail, including non-ASCII text, before anything is written
+MAX_PROBA_DIFF = 1e-5
+
+samples = pd.concat([
+    pd.read_csv("Phishing_validation_emails.csv")["Email Text"],
+    pd.read_csv("CEAS_08.csv", encoding="latin1", nrows=2500)["body"],
+    pd.Series(["\u00bd\u00cf INVOICE \u00c9t\u00e9 \u00fcber caf\u00e9 \u0416\u0418\u0417\u041d\u042c 123"])
+]).fillna("").astype(str).tolist()
+
+sess = ort.InferenceSession(onx.SerializeToString(), providers=["CPUExecutionProvider"])
+onnx_proba = np.vstack([
+    sess.run(["probabilities"], {"input": np.array([t.lower() for t in samples[i:i + 256]], dtype=object).reshape(-1, 1)})[0]
+    for i in range(0, len(samples), 256)
+])
+skl_proba = model.predict_proba(samples)
+
+diff = np.abs(onnx_proba - skl_proba).max(axis=1)
+non_ascii = np.array([not t.isascii() for t in samples])
+print(f"Parity on {len(samples)} emails ({non_ascii.sum()} non-ASCII): max difference {diff.max():.3g}")
+
+if diff.max() > MAX_PROBA_DIFF:
+    print(f"[ERROR] ONNX export differs from scikit-learn by more than {MAX_PROBA_DIFF}; not writing it")
+    sys.exit(1)
+
+with open("phishing_model_full.onnx", "wb") as f:
+    f.write(onx.SerializeToString())
+print("Model exported as phishing_model_full.onnx")
@@ -130,5 +130,6 @@ model.fit(X_full, y_full)
 print("Training done!")
 
 
-joblib.dump(model, "phishing_model_full.pkl")
+# Left uncompressed so the app can memory-map the arrays (engine/model_loader.py)
+joblib.dump(model, "phishing_model_full.pkl", compress=0)
 print("\nModel (trained on dt + dt2 + dt3) saved as phishing_model_full.pkl")
\ No newline at end of file
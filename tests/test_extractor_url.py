@@ -0,0 +1,46 @@
+import threading
+import unittest
+
+from engine.extractor_url import url_features
+
+
+class UppercaseFeatureTest(unittest.TestCase):
+    # Percent escapes decode after lowercasing, so non-ASCII capitals must still count
+
+    def test_percent_encoded_non_ascii_uppercase(self):
+        self.assertEqual(url_features("Click http://login.example.com/%C3%89 now")[9], 1)
+        self.assertEqual(url_features("www.example.com/%D0%96")[9], 1)
+
+    def test_lowercase_url_has_no_uppercase(self):
+        self.assertEqual(url_features("http://example.com/%C3%A9")[9], 0)
+
+
+class ConcurrentUrlFeaturesTest(unittest.TestCase):
+    # Regression: scans from several threads must not share hyperscan scratch space
+
+    def test_threads_match_single_threaded_result(self):
+        text = "see http://login.secure-paypal.example.ru/verify?x=1 and https://bit.ly/abc " * 20
+        expected = url_features(text)
+        errors = []
+        mismatches = []
+
+        def run():
+            for _ in range(500):
+                try:
+                    if url_features(text) != expected:
+                        mismatches.append(1)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(mismatches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()